@@ -2,17 +2,77 @@ import os
 import re
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from slack_bolt import App
 from slack_bolt.adapter.aws_lambda import SlackRequestHandler
+from slack_sdk.http_retry.builtin_handlers import RateLimitErrorRetryHandler
 import pytz
 import json
-import logging
 import boto3
+from boto3.dynamodb.conditions import Attr, Key
 from botocore.exceptions import ClientError
 import hashlib
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Lambdaの実行環境が再利用される間、slack.comへのKeep-Alive接続を使い回す
+# 再試行は接続エラーのみ(POSTは再送しない既定のままにし、使い捨てのOAuthコードを二重送信しない)
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.2)
+))
+
+# リマインダー解析用の正規表現
+_DATE_RE = re.compile(r'(\d{1,2}/\d{1,2})((?:\s+.*?(?=\n\d{1,2}/\d{1,2}|\Z)))', re.DOTALL)
+_MENTION_RE = re.compile(r'(@\S+(?:\s+\([^)]+\))?)')
+
+# アクセストークンのプロセス内キャッシュの有効期限(秒)
+TOKEN_CACHE_TTL = 600
+
+# ユーザーごとのSlack API呼び出しを並列実行するスレッド数
+SLACK_API_MAX_WORKERS = 20
+
+# conversations.inviteに一度に渡せるユーザー数の上限
+SLACK_INVITE_BATCH_SIZE = 1000
+
+# chat.postMessageの1メッセージあたりのブロック数上限
+SLACK_MAX_BLOCKS = 50
+# sectionブロックのtextの文字数上限
+SLACK_SECTION_TEXT_LIMIT = 3000
+
+# 処理済みイベントをDynamoDBに保持する期間(秒)
+PROCESSED_EVENT_TTL = 3600
+# 同一コンテナ内で処理済みイベントを覚えておく件数
+PROCESSED_EVENT_LOCAL_CACHE_SIZE = 1024
+
+def split_section_text(text: str, limit: int = SLACK_SECTION_TEXT_LIMIT) -> List[str]:
+    """sectionブロックの文字数上限に収まるよう、上限より前の最後の改行か空白でテキストを分割する"""
+    chunks: List[str] = []
+    while len(text) > limit:
+        cut = text.rfind('\n', 0, limit + 1)
+        if cut <= 0:
+            cut = max(text.rfind(' ', 0, limit + 1), text.rfind('\u3000', 0, limit + 1))
+        if cut <= 0:
+            # 区切りがない場合も、<@U...>などのメンションの途中では切らない
+            cut = limit
+            open_at = text.rfind('<', 0, limit)
+            if open_at > text.rfind('>', 0, limit) and open_at > 0:
+                cut = open_at
+        chunks.append(text[:cut])
+        text = text[cut:].lstrip()
+    if text:
+        chunks.append(text)
+    return chunks
+
+def reminder_content_hash(date: str, users: List[str], message: str) -> str:
+    """リマインダーの内容(日付・対象者・メッセージ)から変更検知用のハッシュを計算する"""
+    return hashlib.sha256(f"{date}|{','.join(sorted(users))}|{message}".encode()).hexdigest()
 
 def exchange_code_for_token(code: str) -> str:
     """ 認証コードを使ってSlack APIからアクセストークンを取得する """
@@ -20,14 +80,15 @@ def exchange_code_for_token(code: str) -> str:
     client_secret = os.environ['SLACK_CLIENT_SECRET'] 
     redirect_uri = os.environ['SLACK_REDIRECT_URI']
 
-    response = requests.post(
+    response = _SESSION.post(
         "https://slack.com/api/oauth.v2.access",
         data={
             "client_id": client_id,
             "client_secret": client_secret,
             "code": code,
             "redirect_uri": redirect_uri
-        }
+        },
+        timeout=(3, 10)
     )
 
     data = response.json()
@@ -41,8 +102,11 @@ def exchange_code_for_token(code: str) -> str:
 
 def save_access_token(team_id: str, access_token: str) -> None:
     """取得したアクセストークンをDynamoDBに保存"""
-    table = boto3.resource('dynamodb').Table('ReminderSlackAccessTokens')
-    table.put_item(Item={"team_id": team_id, "access_token": access_token})
+    reminder_app = ReminderApp()
+    reminder_app.tokens_table.put_item(Item={"team_id": team_id, "access_token": access_token})
+    # トークンが更新されたため、キャッシュ済みの古いトークンとそれで作成したAppを破棄する
+    reminder_app._token_cache.pop(team_id, None)
+    reminder_app.apps.pop(team_id, None)
 
 class ReminderApp:
     _instance = None
@@ -57,23 +121,60 @@ class ReminderApp:
         self.logger = self.setup_logger()
         #self.load_env()
         self.apps: Dict[str, App] = {}
-        self.schedule_channel_id = None
-        self.reminder_channel_id = None
-        self.team_id = None
-        self.dynamodb = boto3.resource('dynamodb', region_name=os.environ.get('AWS_DEFAULT_REGION', 'us-west-1'))
-        self.test_aws_connection()
-        self.processed_requests = set()
+        # (team_id, チャンネル名) -> チャンネルID
+        self._channel_cache: Dict[Tuple[str, str], str] = {}
+        region = os.environ.get('AWS_DEFAULT_REGION', 'us-west-1')
+        dax_endpoint = os.environ.get('DAX_ENDPOINT')
+        if dax_endpoint:
+            # DAXクラスタ経由でアクセスし、トークンやリマインダーの読み込みをキャッシュする
+            # DAXはlist_tablesなどのコントロールプレーンAPIに対応していないため接続テストは行わない
+            from amazondax import AmazonDaxClient
+            self.dynamodb = AmazonDaxClient.resource(endpoint_url=dax_endpoint, region_name=region)
+        else:
+            self.dynamodb = boto3.resource('dynamodb', region_name=region)
+            # list_tablesはコントロールプレーンAPIで遅いため、デバッグ時のみ接続テストを行う
+            if os.environ.get('REMINDER_DEBUG'):
+                self.test_aws_connection()
+        # Tableオブジェクトの生成を毎回行わないよう、使い回すハンドルを保持する
+        self.reminders_table = self.dynamodb.Table('RemindersTable')
+        self.tokens_table = self.dynamodb.Table('ReminderSlackAccessTokens')
+        self.processed_events_table = self.dynamodb.Table('ProcessedSlackEvents')
+        self.processed_requests: OrderedDict[str, None] = OrderedDict()
+        self._token_cache: Dict[str, Tuple[str, float]] = {}
     
     def is_duplicate_request(self, request_id: str) -> bool:
-        return request_id in self.processed_requests
+        """request_idを処理済みとして記録し、既に処理済みだった場合はTrueを返す
+
+        Slackのリトライや別コンテナでの重複実行を防ぐため、DynamoDBの条件付き書き込みで判定する
+        """
+        if request_id in self.processed_requests:
+            self.processed_requests.move_to_end(request_id)
+            return True
+
+        table = self.processed_events_table
+        try:
+            table.put_item(
+                Item={'message_ts': request_id, 'ttl': int(time.time()) + PROCESSED_EVENT_TTL},
+                ConditionExpression=Attr('message_ts').not_exists()
+            )
+            duplicate = False
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                self.logger.error(f"処理済みイベントの記録に失敗しました: {e}")
+                return False
+            duplicate = True
 
-    def mark_request_as_processed(self, request_id: str) -> None:
-        self.processed_requests.add(request_id)
+        self.processed_requests[request_id] = None
+        if len(self.processed_requests) > PROCESSED_EVENT_LOCAL_CACHE_SIZE:
+            self.processed_requests.popitem(last=False)
+        return duplicate
 
     def get_app(self, team_id: str) -> App:
         if team_id not in self.apps:
             token = self.get_bot_token(team_id)
             self.apps[team_id] = App(token=token)
+            # 並列呼び出しでレート制限に達した場合はRetry-Afterに従って再試行する
+            self.apps[team_id].client.retry_handlers.append(RateLimitErrorRetryHandler(max_retry_count=3))
             self.apps[team_id].event("app_mention")(
                 ack=self.acknowledge_event,
                 lazy=[self.handle_app_mention]
@@ -134,15 +235,24 @@ class ReminderApp:
     def handle_check_schedule(self, ack, body, client):
         try:
             user_id = body["user"]["id"]
+            team_id = body["team"]["id"]
             
-            # DynamoDBからスケジュールを取得
-            table = self.dynamodb.Table('RemindersTable')
-            response = table.scan()
-            schedules = response.get('Items', [])
-            
-            # DMを開く
-            dm = client.conversations_open(users=user_id)
-            dm_channel = dm["channel"]["id"]
+            # DynamoDBからのスケジュール取得とDMのオープンは独立しているため並行して行う
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                # DynamoDBからリクエスト元チームのスケジュールのみ取得
+                schedules_future = executor.submit(
+                    self.query_all,
+                    self.reminders_table,
+                    KeyConditionExpression=Key('team_id').eq(team_id),
+                    # asyncapp.pyが同じパーティションに保存するチャンネルIDの設定行(date=CONFIG#...)は除く
+                    FilterExpression=~Attr('date').begins_with('CONFIG#'),
+                    ProjectionExpression='#u, #m, #d',
+                    ExpressionAttributeNames={'#u': 'users', '#m': 'message', '#d': 'date'}
+                )
+                # DMを開く
+                dm_future = executor.submit(client.conversations_open, users=user_id)
+                schedules = schedules_future.result()
+                dm_channel = dm_future.result()["channel"]["id"]
             
             if not schedules:
                 client.chat_postMessage(
@@ -168,12 +278,30 @@ class ReminderApp:
             self.logger.error(f"スケジュール確認中にエラーが発生しました: {e}")
 
 
+    @staticmethod
+    def query_all(table: Any, **kwargs: Any) -> List[Dict[str, Any]]:
+        """LastEvaluatedKeyをたどり、1MBを超える結果も含めてQueryの全ページを取得する"""
+        items: List[Dict[str, Any]] = []
+        while True:
+            response = table.query(**kwargs)
+            items.extend(response.get('Items', []))
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return items
+            kwargs['ExclusiveStartKey'] = last_key
+
     def get_bot_token(self, team_id: str) -> str:
         """DynamoDBからteam_idに対応するアクセストークンを取得"""
+        cached = self._token_cache.get(team_id)
+        if cached and time.time() - cached[1] < TOKEN_CACHE_TTL:
+            return cached[0]
         try:
-            table = self.dynamodb.Table('ReminderSlackAccessTokens')
-            response = table.get_item(Key={"team_id": team_id})
-            return response['Item']['access_token']
+            table = self.tokens_table
+            # トークンはインストール時に一度書き込まれるだけなので結果整合性読み込みで十分
+            response = table.get_item(Key={"team_id": team_id}, ConsistentRead=False)
+            token = response['Item']['access_token']
+            self._token_cache[team_id] = (token, time.time())
+            return token
         except Exception as e:
             self.logger.error(f"アクセストークンの取得に失敗しました: {str(e)}")
             # フォールバックとしてSSMから取得
@@ -224,6 +352,10 @@ class ReminderApp:
     def setup_logger():
         logger = logging.getLogger(__name__)
         logger.setLevel(logging.INFO)
+        # Lambdaのルートロガーにも伝播すると同じ行が二重に出力されるため止める
+        logger.propagate = False
+        if logger.handlers:
+            return logger
         handler = logging.StreamHandler()
         formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         handler.setFormatter(formatter)
@@ -238,38 +370,41 @@ class ReminderApp:
             self.logger.error(f"AWSへの接続テストに失敗しました: {str(e)}")
             raise
 
-    def parse_and_save_reminders(self, text: str, message_ts: str) -> bool:
-        table = self.dynamodb.Table('RemindersTable')
+    def parse_and_save_reminders(self, team_id: str, text: str, message_ts: str) -> bool:
+        table = self.reminders_table
         
-        date_pattern: str = r'(\d{1,2}/\d{1,2})((?:\s+.*?(?=\n\d{1,2}/\d{1,2}|\Z)))'
-        reminders: List[tuple] = re.findall(date_pattern, text, re.DOTALL)
+        reminders: List[tuple] = _DATE_RE.findall(text)
         
         success = True
-        changes = []
+        items: List[Dict[str, Any]] = []
         for date, content in reminders:
-            mention_pattern: str = r'(@\S+(?:\s+\([^)]+\))?)'
-            mentions: List[str] = re.findall(mention_pattern, content)
+            mentions: List[str] = _MENTION_RE.findall(content)
             mentions = ['<' + mention for mention in mentions]
-            message: str = re.sub(mention_pattern, '', content).strip()
+            message: str = _MENTION_RE.sub('', content).strip()
             
-            item: Dict[str, Any] = {
-                'team_id': self.team_id,
-                'date': date.strip(),
+            date = date.strip()
+            items.append({
+                'team_id': team_id,
+                'date': date,
                 'users': mentions,
                 'message': message,
-                'message_ts': message_ts
-            }
-            existing_items = table.query(
-                    KeyConditionExpression='team_id = :team_id AND #date = :date',
-                    ExpressionAttributeNames={'#date': 'date'},
-                    ExpressionAttributeValues={':team_id': self.team_id, ':date': item['date']}
-            )
-                
-            if existing_items.get('Items'):
-                self.logger.info(f"既存のリマインダー: {existing_items['Items']}")
+                'message_ts': message_ts,
+                'content_hash': reminder_content_hash(date, mentions, message)
+            })
+
+        # 既存のリマインダーを一括取得し、差分はPython側で判定する
+        existing_items = self.batch_get_reminders(team_id, [item['date'] for item in items])
+
+        changes = []
+        for item in items:
+            old_item = existing_items.get(item['date'])
+            if old_item:
+                self.logger.info(f"既存のリマインダー: {old_item}")
                 self.logger.info(f"新規のリマインダー: {item}")
-                old_item = existing_items['Items'][0]
-                if {k: v for k, v in old_item.items() if k != 'message_ts'} != {k: v for k, v in item.items() if k != 'message_ts'}:
+                # content_hashを持たない既存データは保存済みの内容からハッシュを計算する
+                old_hash = old_item.get('content_hash') or reminder_content_hash(
+                    old_item['date'], old_item.get('users', []), old_item.get('message', ''))
+                if old_hash != item['content_hash']:
                    
                     changes.append({
                             'type': '更新',
@@ -281,18 +416,37 @@ class ReminderApp:
                         'type': '新規作成',
                         'new': item
                     })
-                
-            table.put_item(Item=item)
-            self.logger.info(f"リマインダーを保存しました: 日付: {item['date']}, ユーザー: {', '.join(item['users'])}, メッセージ: {item['message']}")
+
+        # 内容が変わっていないリマインダーは書き込まない
+        # batch_writerが25件ずつまとめて書き込み、UnprocessedItemsも再送する
+        with table.batch_writer(overwrite_by_pkeys=['team_id', 'date']) as batch:
+            for item in (change['new'] for change in changes):
+                batch.put_item(Item=item)
+                self.logger.info(f"リマインダーを保存しました: 日付: {item['date']}, ユーザー: {', '.join(item['users'])}, メッセージ: {item['message']}")
         
         if changes:
-            self.notify_changes(changes, message_ts)
+            self.notify_changes(team_id, changes, message_ts)
         else:
             self.logger.info("リマインダーの変更はありませんでした。")
         
         return success
 
-    def notify_changes(self, changes: List[Dict[str, Any]], message_ts: str) -> None:
+    def batch_get_reminders(self, team_id: str, dates: List[str]) -> Dict[str, Dict[str, Any]]:
+        """指定した日付のリマインダーをBatchGetItemでまとめて取得し、日付をキーにして返す"""
+        keys = [{'team_id': team_id, 'date': date} for date in dict.fromkeys(dates)]
+        existing_items: Dict[str, Dict[str, Any]] = {}
+        # BatchGetItemは1リクエストあたり100キーまで
+        for i in range(0, len(keys), 100):
+            # 上書き保存の差分判定のみに使うため結果整合性読み込みでRCUを半減させる
+            request_items = {'RemindersTable': {'Keys': keys[i:i + 100], 'ConsistentRead': False}}
+            while request_items:
+                response = self.dynamodb.batch_get_item(RequestItems=request_items)
+                for item in response.get('Responses', {}).get('RemindersTable', []):
+                    existing_items[item['date']] = item
+                request_items = response.get('UnprocessedKeys')
+        return existing_items
+
+    def notify_changes(self, team_id: str, changes: List[Dict[str, Any]], message_ts: str) -> None:
         change_messages = []
         for change in changes:
             if change['type'] == '更新':
@@ -311,75 +465,103 @@ class ReminderApp:
         change_message = "\n\n".join(change_messages)
         self.logger.info(f"リマインダーの変更:\n{change_message}")
         
-        app = self.get_app(self.team_id)
+        app = self.get_app(team_id)
         app.client.chat_postMessage(
-            channel=self.schedule_channel_id,
+            channel=self.get_or_create_schedule_channel(team_id),
             text=f"リマインダーが更新されました。\n{change_message}",
             thread_ts=message_ts
         )
 
     @staticmethod
-    def acknowledge_event(body: Dict[str, Any], ack: callable) -> None:
-        ack("リクエストを受け取り、処理中です。")
+    def acknowledge_event(ack: callable) -> None:
+        # Slackには空の200を返すだけでよいため、本文は付けずに即座にackする
+        ack()
 
-    def get_or_create_channel(self, channel_name: str) -> str:
-        channel_id = getattr(self, f"{channel_name}_channel_id")
+    def get_or_create_channel(self, team_id: str, channel_name: str) -> str:
+        channel_id = self._channel_cache.get((team_id, channel_name))
         if channel_id:
             return channel_id
 
-        app = self.get_app(self.team_id)
-        channels = app.client.conversations_list()
-        for channel in channels["channels"]:
-            if channel["name"] == channel_name:
-                setattr(self, f"{channel_name}_channel_id", channel["id"])
-                return channel["id"]
+        app = self.get_app(team_id)
+        # カーソルでページングしながら探し、見つかった時点で打ち切る
+        for page in app.client.conversations_list(types="public_channel", exclude_archived=True, limit=1000):
+            for channel in page["channels"]:
+                if channel["name"] == channel_name:
+                    self._channel_cache[(team_id, channel_name)] = channel["id"]
+                    return channel["id"]
         
         new_channel = app.client.conversations_create(name=channel_name)
         channel_id = new_channel["channel"]["id"]
-        setattr(self, f"{channel_name}_channel_id", channel_id)
+        self._channel_cache[(team_id, channel_name)] = channel_id
         self.logger.info(f"新しい{channel_name}チャンネルを作成しました: {channel_id}")
 
-        users = app.client.users_list()
-        for user in users["members"]:
-            if not user["is_bot"] and not user["is_app_user"]:
-                try:
-                    app.client.conversations_invite(
-                        channel=channel_id,
-                        users=user["id"]
-                    )
-                except Exception as e:
-                    self.logger.error(f"ユーザー {user['id']} を{channel_name}チャンネルに追加できませんでした: {str(e)}")
+        user_ids = self.list_human_user_ids(app.client)
+        self.invite_users(app.client, channel_id, user_ids)
 
         return channel_id
 
-    def get_or_create_schedule_channel(self) -> str:
-        return self.get_or_create_channel("schedule")
+    def invite_users(self, client: Any, channel_id: str, user_ids: List[str]) -> None:
+        """conversations.inviteに最大1000人分のユーザーIDをまとめて渡してチャンネルに招待する"""
+        for i in range(0, len(user_ids), SLACK_INVITE_BATCH_SIZE):
+            batch = user_ids[i:i + SLACK_INVITE_BATCH_SIZE]
+            try:
+                # force=Trueで既に参加済みなどの無効なユーザーを無視して残りを招待し、失敗分はerrorsで受け取る
+                response = client.conversations_invite(
+                    channel=channel_id,
+                    users=",".join(batch),
+                    force=True
+                )
+            except Exception as e:
+                self.logger.error(f"ユーザー{len(batch)}人をチャンネル {channel_id} に追加できませんでした: {str(e)}")
+                continue
+            for error in response.get("errors", []):
+                self.logger.error(f"ユーザー {error.get('user')} をチャンネル {channel_id} に追加できませんでした: {error.get('error')}")
 
-    def get_or_create_reminder_channel(self) -> str:
-        return self.get_or_create_channel("reminder")
+    @staticmethod
+    def list_human_user_ids(client: Any) -> List[str]:
+        """ワークスペース内のボット以外のユーザーIDを全ページ分取得する"""
+        return [
+            user["id"]
+            for page in client.users_list(limit=1000)
+            for user in page["members"]
+            if not user["is_bot"] and not user["is_app_user"] and not user.get("deleted")
+        ]
+
+    def get_or_create_schedule_channel(self, team_id: str) -> str:
+        return self.get_or_create_channel(team_id, "schedule")
+
+    def get_or_create_reminder_channel(self, team_id: str) -> str:
+        return self.get_or_create_channel(team_id, "reminder")
+
+    def get_or_create_channels(self, team_id: str) -> Tuple[str, str]:
+        """スケジュールチャンネルとリマインダーチャンネルを並行して取得(なければ作成)する"""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            schedule_future = executor.submit(self.get_or_create_schedule_channel, team_id)
+            reminder_future = executor.submit(self.get_or_create_reminder_channel, team_id)
+            return schedule_future.result(), reminder_future.result()
 
     def handle_app_mention(self, body: Dict[str, Any], say: callable) -> None:
         self.logger.info(f"受信したメンション: {body}")
         event: Dict[str, Any] = body["event"]
         channel: str = event["channel"]
         text: str = event["text"]
-        self.team_id = body["team_id"]
+        team_id: str = body["team_id"]
         edited  = event.get("edited")
         message_ts: str = edited["ts"] if edited else event["ts"] 
         if self.is_duplicate_request(message_ts):
+            self.logger.info(f"処理済みのイベントのためスキップしました: {message_ts}")
             return
-        else :
-            self.mark_request_as_processed(message_ts)
 
         if "test" in text.lower():
-            self.send_reminders(body, None)
+            # テスト送信はメンションしたチームの当日分だけに限定する
+            self.send_reminders(body, None, team_id=team_id)
             say("テストリマインダーを送信しました。")
             return
 
-        schedule_channel = self.get_or_create_schedule_channel()
+        schedule_channel = self.get_or_create_schedule_channel(team_id)
         if channel == schedule_channel:
-            success = self.parse_and_save_reminders(text, message_ts)
-            app = self.get_app(self.team_id)
+            success = self.parse_and_save_reminders(team_id, text, message_ts)
+            app = self.get_app(team_id)
             if success:
                 if edited:
                     app.client.chat_postMessage(
@@ -412,91 +594,116 @@ class ReminderApp:
         
         
 
-    def send_reminders(self, event: Dict[str, Any], context: Any) -> None:
+    def send_reminders(self, event: Dict[str, Any], context: Any, team_id: Optional[str] = None) -> None:
+        """当日のリマインダーを送信する。team_idを指定した場合はそのチームの分のみ送信する"""
         self.logger.info(f"受信したイベント: {event}")
         jst: pytz.timezone = pytz.timezone('Asia/Tokyo')
         now: datetime = datetime.now(jst)
         today: str = now.strftime("%m/%d")
 
-        table = self.dynamodb.Table('RemindersTable')
+        table = self.reminders_table
+        query_kwargs: Dict[str, Any] = {
+            'ProjectionExpression': 'team_id, #u, #m, #d',
+            'ExpressionAttributeNames': {'#u': 'users', '#m': 'message', '#d': 'date'}
+        }
+        if team_id:
+            # 主キー(team_id, date)で対象チームの当日分のみ取得
+            query_kwargs['KeyConditionExpression'] = Key('team_id').eq(team_id) & Key('date').eq(today)
+        else:
+            # date-index (GSI) から当日分のみ取得
+            query_kwargs['IndexName'] = 'date-index'
+            query_kwargs['KeyConditionExpression'] = Key('date').eq(today)
         try:
-            response: Dict[str, Any] = table.scan(
-                FilterExpression='#date = :today',
-                ExpressionAttributeNames={'#date': 'date'},
-                ExpressionAttributeValues={':today': today}
-            )
+            items = self.query_all(table, **query_kwargs)
         except ClientError as e:
             self.logger.error(f"リマインダーの取得に失敗しました: {e}")
             return
 
         reminders_by_team = {}
-        for item in response.get('Items', []):
+        for item in items:
             team_id = item['team_id']
             if team_id not in reminders_by_team:
                 reminders_by_team[team_id] = []
             reminders_by_team[team_id].append(item)
 
-        for team_id, reminders in reminders_by_team.items():
-            self.team_id = team_id
-            app = self.get_app(team_id)
-            reminder_channel = self.get_or_create_reminder_channel()
-            for item in reminders:
-                users: List[str] = item['users']
-                message: str = item['message']
-                mentions: str = ' '.join([f"{user}" for user in users])
-                app.client.chat_postMessage(
-                    channel=reminder_channel,
-                    text=f"{mentions} リマインダー: {message}"
-                )
-                self.logger.info(f"リマインダーを送信しました: {item}")
-    
+        if not reminders_by_team:
+            return
+
+        # チームごとの送信は互いに独立しているため並列に実行する
+        with ThreadPoolExecutor(max_workers=min(32, len(reminders_by_team))) as executor:
+            futures = [
+                executor.submit(self._dispatch_team_reminders, team_id, reminders)
+                for team_id, reminders in reminders_by_team.items()
+            ]
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    self.logger.error(f"リマインダーの送信に失敗しました: {e}")
+
+    def _dispatch_team_reminders(self, team_id: str, reminders: List[Dict[str, Any]]) -> None:
+        app = self.get_app(team_id)
+        reminder_channel = self.get_or_create_reminder_channel(team_id)
+        lines: List[str] = []
+        for item in reminders:
+            users: List[str] = item['users']
+            message: str = item['message']
+            mentions: str = ' '.join([f"{user}" for user in users])
+            line = f"{mentions} リマインダー: {message}"
+            # 長いリマインダーはinvalid_blocksにならないよう複数のブロックに分ける
+            lines.extend(split_section_text(line))
+
+        # チームごとのリマインダーを1メッセージにまとめて送信する(1メッセージあたり最大50ブロック)
+        for i in range(0, len(lines), SLACK_MAX_BLOCKS):
+            chunk = lines[i:i + SLACK_MAX_BLOCKS]
+            app.client.chat_postMessage(
+                channel=reminder_channel,
+                text="\n".join(chunk),
+                blocks=[{"type": "section", "text": {"type": "mrkdwn", "text": line}} for line in chunk]
+            )
+        self.logger.info(f"リマインダーを送信しました: {reminders}")
+
 
 
     def handle_app_installed(self, event: Dict[str, Any], client: Any) -> None:
         self.logger.info(f"アプリがインストールされました: {event}")
-        self.team_id = event["team_id"]
-        schedule_channel = self.get_or_create_schedule_channel()
-        reminder_channel = self.get_or_create_reminder_channel()
+        team_id: str = event["team_id"]
+        schedule_channel, reminder_channel = self.get_or_create_channels(team_id)
         
         # ワークスペース内の全ユーザーを取得
         try:
-            response = client.users_list()
-            for user in response["members"]:
-                if not user["is_bot"] and not user["is_app_user"]:
-                    user_id = user["id"]
-                    # 各ユーザーとDMを開く
-                    try:
-                        dm_response = client.conversations_open(users=user_id)
-                        dm_channel = dm_response["channel"]["id"]
-                        client.chat_postMessage(
-                            channel=dm_channel,
-                            text="はじめまして！私はリマインダーボットです。スケジュールの管理をお手伝いさせていただきます。"
-                        )
-                        self.logger.info(f"メンバー {user_id} とのDMを開始しました。")
-                    except Exception as e:
-                        self.logger.error(f"メンバー {user_id} とのDM開始に失敗しました: {str(e)}")
-                    
-                    # チャンネルに招待
-                    try:
-                        client.conversations_invite(
-                            channel=schedule_channel,
-                            users=user_id
-                        )
-                        client.conversations_invite(
-                            channel=reminder_channel, 
-                            users=user_id
-                        )
-                    except Exception as e:
-                        self.logger.error(f"メンバー {user_id} のチャンネル招待に失敗しました: {str(e)}")
+            user_ids = self.list_human_user_ids(client)
         except Exception as e:
             self.logger.error(f"ユーザーリストの取得に失敗しました: {str(e)}")
+            return
+
+        # チャンネルへの招待はチャンネルごとにまとめて行う
+        self.invite_users(client, schedule_channel, user_ids)
+        self.invite_users(client, reminder_channel, user_ids)
+
+        with ThreadPoolExecutor(max_workers=SLACK_API_MAX_WORKERS) as executor:
+            futures = [executor.submit(self.greet_user, client, user_id) for user_id in user_ids]
+            for _ in as_completed(futures):
+                pass
+
+    def greet_user(self, client: Any, user_id: str) -> None:
+        """ユーザーとのDMを開いて挨拶する"""
+        try:
+            dm_response = client.conversations_open(users=user_id)
+            dm_channel = dm_response["channel"]["id"]
+            client.chat_postMessage(
+                channel=dm_channel,
+                text="はじめまして！私はリマインダーボットです。スケジュールの管理をお手伝いさせていただきます。"
+            )
+            self.logger.info(f"メンバー {user_id} とのDMを開始しました。")
+        except Exception as e:
+            self.logger.error(f"メンバー {user_id} とのDM開始に失敗しました: {str(e)}")
 
     def handle_team_join(self, event: Dict[str, Any], client: Any) -> None:
         self.logger.info(f"新しいメンバーがワークスペースに参加しました: {event}")
         user_id = event["user"]["id"]
-        self.team_id = event["team_id"]
-        schedule_channel = self.get_or_create_schedule_channel()
-        reminder_channel = self.get_or_create_reminder_channel()
+        team_id: str = event["team_id"]
+        schedule_channel, reminder_channel = self.get_or_create_channels(team_id)
 
         # 新しいユーザーとのDMを開く
         try:
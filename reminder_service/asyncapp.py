@@ -2,16 +2,116 @@ import os
 import re
 import logging
 from datetime import datetime
-from typing import Dict, List, Any
+from zoneinfo import ZoneInfo
+from typing import Dict, List, Any, Tuple
 from slack_bolt.async_app import AsyncApp
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
+from slack_sdk.http_retry.builtin_async_handlers import AsyncRateLimitErrorRetryHandler
 from slack_bolt.adapter.aws_lambda import SlackRequestHandler
 import asyncio
-import pytz
+import contextlib
+import io
+import operator
+import aiohttp
+import time
 import json
-import logging
-import boto3
+try:
+    import orjson
+except ImportError:
+    # orjsonが入っていないローカル環境では標準のjsonで動かす
+    orjson = None
+import aioboto3
+from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
 
+_JST = ZoneInfo("Asia/Tokyo")
+
+def _json_loads(data: str) -> Any:
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def _json_dumps(obj: Any) -> str:
+    return orjson.dumps(obj).decode() if orjson else json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+# 既存のリマインダーと比較して変更の有無を判定する項目
+_CMP_KEYS = ('team_id', 'date', 'users', 'message')
+_CMP = operator.itemgetter(*_CMP_KEYS)
+
+# リマインダー解析用の正規表現
+_DATE_RE = re.compile(r'(\d{1,2}/\d{1,2})((?:\s+.*?(?=\n\d{1,2}/\d{1,2}|\Z)))', re.DOTALL)
+
+def _extract_mentions(content: str) -> Tuple[List[str], str]:
+    r"""contentからメンションを取り出し、(メンション一覧, メンションを除いた本文)を返す
+
+    r'@\S+(?:\s+\([^)]+\))?' の findall と sub を1回の走査で行う
+    """
+    mentions: List[str] = []
+    segments: List[str] = []
+    i = 0
+    n = len(content)
+    while True:
+        at = content.find('@', i)
+        if at == -1:
+            segments.append(content[i:])
+            return mentions, ''.join(segments)
+        j = at + 1
+        while j < n and not content[j].isspace():
+            j += 1
+        if j == at + 1:
+            # '@'の直後が空白または末尾の場合はメンションではない
+            segments.append(content[i:j])
+            i = j
+            continue
+        # 空白に続く"(...)"は表示名としてメンションに含める
+        k = j
+        while k < n and content[k].isspace():
+            k += 1
+        if j < k < n and content[k] == '(':
+            close = content.find(')', k + 1)
+            if close > k + 1:
+                j = close + 1
+        segments.append(content[i:at])
+        mentions.append(content[at:j])
+        i = j
+
+# ウォームスタート間でイベントループとSlackへのKeep-Alive接続を使い回すため、ループはモジュールで1つだけ作る
+_LOOP = asyncio.new_event_loop()
+asyncio.set_event_loop(_LOOP)
+
+# handle_message_changedで処理しないメッセージのsubtype
+_IGNORED_MESSAGE_SUBTYPES = {"bot_message", "channel_join", "channel_leave"}
+
+# chat.postMessageの1メッセージあたりのブロック数上限
+SLACK_MAX_BLOCKS = 50
+# sectionブロックのtextの文字数上限
+SLACK_SECTION_TEXT_LIMIT = 3000
+
+# conversations.inviteに一度に渡せるユーザー数の上限
+SLACK_INVITE_BATCH_SIZE = 1000
+
+# トークン・チャンネルIDのプロセス内キャッシュの有効期限(秒)
+TOKEN_CACHE_TTL = 900
+CHANNEL_CACHE_TTL = 900
+
+def _split_section_text(text: str, limit: int = SLACK_SECTION_TEXT_LIMIT) -> List[str]:
+    """sectionブロックの文字数上限に収まるよう、上限より前の最後の改行か空白でテキストを分割する"""
+    chunks: List[str] = []
+    while len(text) > limit:
+        cut = text.rfind('\n', 0, limit + 1)
+        if cut <= 0:
+            cut = max(text.rfind(' ', 0, limit + 1), text.rfind('\u3000', 0, limit + 1))
+        if cut <= 0:
+            # 区切りがない場合も、<@U...>などのメンションの途中では切らない
+            cut = limit
+            open_at = text.rfind('<', 0, limit)
+            if open_at > text.rfind('>', 0, limit) and open_at > 0:
+                cut = open_at
+        chunks.append(text[:cut])
+        text = text[cut:].lstrip()
+    if text:
+        chunks.append(text)
+    return chunks
+
 class ReminderApp:
     _instance = None
     
@@ -23,18 +123,41 @@ class ReminderApp:
 
     def initialize(self):
         self.logger = self.setup_logger()
+        # DynamoDB/SSMへのI/Oでイベントループをブロックしないようaioboto3を使う
+        self.session = aioboto3.Session()
+        # aioboto3のSSMクライアントとDynamoDBリソース(_LOOP上で遅延生成し、閉じずに使い回す)
+        self._async_exit_stack = contextlib.AsyncExitStack()
+        # 並行して呼ばれた場合に同じクライアントを重複して作成し、exit stackに残さないためのロック
+        self._async_exit_stack_lock = asyncio.Lock()
+        self._async_ssm = None
+        self._reminders_table = None
+        # SSMクライアントはload_envでも使うため、設定値を読む前のリージョンで作る
+        self.region = os.environ.get('AWS_DEFAULT_REGION', 'us-west-1')
         self.load_env()
         self.apps: Dict[str, AsyncApp] = {}
-        self.schedule_channel_id = None
-        self.reminder_channel_id = None
-        self.team_id = None
-        self.dynamodb = boto3.resource('dynamodb', region_name=os.environ.get('AWS_DEFAULT_REGION', 'us-west-1'))
-        self.test_aws_connection()
+        # チームごとのSlackRequestHandler(appと同じくウォームスタート間で使い回す)
+        self._handlers: Dict[str, SlackRequestHandler] = {}
+        # 全チームのAsyncWebClientで共有するHTTPセッション(_LOOP上で遅延生成し、閉じずに使い回す)
+        self._http_session: aiohttp.ClientSession = None
+        self._token_cache: Dict[str, Tuple[str, float]] = {}
+        # (team_id, チャンネル名) -> (チャンネルID, 取得時刻)
+        self._channel_cache: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self.region = self.env('AWS_DEFAULT_REGION', self.region)
+        self.aws_connection_tested = False
+        # コールドスタート時に全チームのトークンをまとめて取得し、get_bot_tokenを毎回キャッシュヒットさせる
+        _LOOP.run_until_complete(self._prewarm_tokens())
 
     async def get_app(self, team_id: str) -> AsyncApp:
         if team_id not in self.apps:
             token = await self.get_bot_token(team_id)
-            self.apps[team_id] = AsyncApp(token=token)
+            if self._http_session is None:
+                self._http_session = aiohttp.ClientSession()
+            self.apps[team_id] = AsyncApp(
+                client=AsyncWebClient(token=token, session=self._http_session),
+                signing_secret=self.env('SLACK_SIGNING_SECRET')
+            )
+            # 並行送信でレート制限に達した場合はRetry-Afterに従って再試行する
+            self.apps[team_id].client.retry_handlers.append(AsyncRateLimitErrorRetryHandler(max_retry_count=3))
             self.apps[team_id].event("app_mention")(
                 ack=self.acknowledge_event,
                 lazy=[self.handle_app_mention]
@@ -54,23 +177,38 @@ class ReminderApp:
         return self.apps[team_id]
 
     def load_env(self):
+        """env.jsonまたはSSMの設定値をself.env_varsに読み込む。
+        env.jsonはローカル実行用のため、boto3やslack_sdkが参照できるよう全ての値を環境変数にも設定する。
+        SSMの値はシークレットを含むため、環境変数にはAWS_DEFAULT_REGIONのみ設定する"""
+        self.env_vars: Dict[str, str] = {}
         try:
             with open('env.json', 'r') as f:
                 self.env_vars = json.load(f)
             for key, value in self.env_vars.items():
-                os.environ[key] = value
+                os.environ[key] = str(value)
         except FileNotFoundError:
             self.logger.info("env.jsonファイルが見つかりません。AWS Systems Managerからパラメータを取得します。")
-            ssm = boto3.client('ssm')
-            paginator = ssm.get_paginator('get_parameters_by_path')
-            for page in paginator.paginate(Path='/slack', Recursive=True, WithDecryption=True):
-                for param in page['Parameters']:
-                    key = param['Name'].split('/')[-1]
-                    os.environ[key] = param['Value']
-                    self.logger.info(f"key:{key}:value{param['Value']}")
-            self.logger.info("AWS Systems Managerからパラメータを環境変数に設定しました。")
+            # get_bot_tokenと同じaioboto3のSSMクライアントを使い、SSMクライアントを2つ持たないようにする
+            _LOOP.run_until_complete(self._load_ssm_parameters())
+            self.logger.info("AWS Systems Managerからパラメータを取得しました。")
         except json.JSONDecodeError:
             self.logger.error("env.jsonファイルの解析に失敗しました。")
+        # boto3は環境変数からリージョンを読むため、SSMから取得した場合もこれだけは環境変数に設定する
+        if 'AWS_DEFAULT_REGION' in self.env_vars:
+            os.environ['AWS_DEFAULT_REGION'] = self.env_vars['AWS_DEFAULT_REGION']
+
+    async def _load_ssm_parameters(self) -> None:
+        ssm = await self.get_async_ssm()
+        paginator = ssm.get_paginator('get_parameters_by_path')
+        async for page in paginator.paginate(Path='/slack', Recursive=True, WithDecryption=True):
+            for param in page['Parameters']:
+                key = param['Name'].split('/')[-1]
+                self.env_vars[key] = param['Value']
+                self.logger.info(f"key:{key}:value{param['Value']}")
+
+    def env(self, key: str, default: Any = None) -> Any:
+        """設定値を取得する。load_envで読み込んだ値を優先し、なければ環境変数を参照する"""
+        return self.env_vars.get(key) or os.environ.get(key, default)
 
     def save_env(self):
         try:
@@ -83,53 +221,70 @@ class ReminderApp:
     def setup_logger():
         logger = logging.getLogger(__name__)
         logger.setLevel(logging.INFO)
+        # Lambdaのルートロガーにも伝播すると同じ行が二重に出力されるため止める
+        logger.propagate = False
+        if logger.handlers:
+            return logger
         handler = logging.StreamHandler()
         formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         handler.setFormatter(formatter)
         logger.addHandler(handler)
         return logger
 
-    def test_aws_connection(self):
+    async def test_aws_connection(self):
         try:
-            self.dynamodb.meta.client.list_tables()
+            async with self.session.client('dynamodb', region_name=self.region) as dynamodb:
+                await dynamodb.list_tables()
+            self.aws_connection_tested = True
             self.logger.info("AWSへの接続テストに成功しました。")
         except Exception as e:
             self.logger.error(f"AWSへの接続テストに失敗しました: {str(e)}")
             raise
 
-    async def parse_and_save_reminders(self, text: str, message_ts: str) -> bool:
-        table = self.dynamodb.Table('RemindersTable')
-        
-        date_pattern: str = r'(\d{1,2}/\d{1,2})((?:\s+.*?(?=\n\d{1,2}/\d{1,2}|\Z)))'
-        reminders: List[tuple] = re.findall(date_pattern, text, re.DOTALL)
+    async def parse_and_save_reminders(self, app: AsyncApp, team_id: str, text: str, message_ts: str) -> bool:
+        reminders: List[tuple] = _DATE_RE.findall(text)
         
         success = True
-        changes = []
+        items: List[Dict[str, Any]] = []
         for date, content in reminders:
-            mention_pattern: str = r'(@\S+(?:\s+\([^)]+\))?)'
-            mentions: List[str] = re.findall(mention_pattern, content)
+            mentions, message = _extract_mentions(content)
             mentions = ['<' + mention for mention in mentions]
-            message: str = re.sub(mention_pattern, '', content).strip()
+            message = message.strip()
             
-            item: Dict[str, Any] = {
-                'team_id': self.team_id,
+            items.append({
+                'team_id': team_id,
                 'date': date.strip(),
                 'users': mentions,
                 'message': message,
                 'message_ts': message_ts
-            }
-            existing_items = table.query(
-                    KeyConditionExpression='team_id = :team_id AND #date = :date',
-                    ExpressionAttributeNames={'#date': 'date'},
-                    ExpressionAttributeValues={':team_id': self.team_id, ':date': item['date']}
-            )
-                
-            if existing_items.get('Items'):
-                self.logger.info(f"既存のリマインダー: {existing_items['Items']}")
+            })
+        if not items:
+            self.logger.info("リマインダーの変更はありませんでした。")
+            return success
+
+        table = await self.get_reminders_table()
+        # 対象期間の既存リマインダーを1回のQueryでまとめて取得し、日付で引けるようにする
+        dates = [item['date'] for item in items]
+        query_kwargs: Dict[str, Any] = {
+            'KeyConditionExpression': Key('team_id').eq(team_id) & Key('date').between(min(dates), max(dates))
+        }
+        existing_items: Dict[str, Dict[str, Any]] = {}
+        while True:
+            response = await table.query(**query_kwargs)
+            for existing in response.get('Items', []):
+                existing_items[existing['date']] = existing
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        changes = []
+        for item in items:
+            old_item = existing_items.get(item['date'])
+            if old_item:
+                self.logger.info(f"既存のリマインダー: {old_item}")
                 self.logger.info(f"新規のリマインダー: {item}")
-                old_item = existing_items['Items'][0]
-                if {k: v for k, v in old_item.items() if k != 'message_ts'} != {k: v for k, v in item.items() if k != 'message_ts'}:
-                   
+                if _CMP(old_item) != _CMP(item):
+                       
                     changes.append({
                             'type': '更新',
                             'old': old_item,
@@ -140,82 +295,149 @@ class ReminderApp:
                         'type': '新規作成',
                         'new': item
                     })
-                
-            table.put_item(Item=item)
-            self.logger.info(f"リマインダーを保存しました: 日付: {item['date']}, ユーザー: {', '.join(item['users'])}, メッセージ: {item['message']}")
+
+        # batch_writerが25件ずつまとめて書き込み、同じ日付が重複した場合は後勝ちにする
+        async with table.batch_writer(overwrite_by_pkeys=['team_id', 'date']) as batch:
+            for item in items:
+                await batch.put_item(Item=item)
+                self.logger.info(f"リマインダーを保存しました: 日付: {item['date']}, ユーザー: {', '.join(item['users'])}, メッセージ: {item['message']}")
         
         if changes:
-            await self.notify_changes(changes, message_ts)
+            await self.notify_changes(app, team_id, changes, message_ts)
         else:
             self.logger.info("リマインダーの変更はありませんでした。")
         
         return success
 
-    async def notify_changes(self, changes: List[Dict[str, Any]], message_ts: str) -> None:
-        change_messages = []
-        for change in changes:
+    async def notify_changes(self, app: AsyncApp, team_id: str, changes: List[Dict[str, Any]], message_ts: str) -> None:
+        buf = io.StringIO()
+        for i, change in enumerate(changes):
+            if i:
+                buf.write("\n\n")
             if change['type'] == '更新':
                 old, new = change['old'], change['new']
-                change_messages.append(f"更新:\n"
-                                       f"日付: {new['date']}\n"
-                                       f"ユーザー: {', '.join(old['users'])} → {', '.join(new['users'])}\n"
-                                       f"メッセージ: {old['message']} → {new['message']}")
+                buf.write(f"更新:\n"
+                          f"日付: {new['date']}\n"
+                          f"ユーザー: {', '.join(old['users'])} → {', '.join(new['users'])}\n"
+                          f"メッセージ: {old['message']} → {new['message']}")
             else:
                 new = change['new']
-                change_messages.append(f"新規作成:\n"
-                                       f"日付: {new['date']}\n"
-                                       f"ユーザー: {', '.join(new['users'])}\n"
-                                       f"メッセージ: {new['message']}")
+                buf.write(f"新規作成:\n"
+                          f"日付: {new['date']}\n"
+                          f"ユーザー: {', '.join(new['users'])}\n"
+                          f"メッセージ: {new['message']}")
         
-        change_message = "\n\n".join(change_messages)
+        change_message = buf.getvalue()
         self.logger.info(f"リマインダーの変更:\n{change_message}")
         
-        app = self.get_app(self.team_id)
-        await app.client.chat_postMessage(
-            channel=self.schedule_channel_id,
-            text=f"リマインダーが更新されました。変更内容:\n{change_message}",
-            thread_ts=message_ts
-        )
+        text = f"リマインダーが更新されました。変更内容:\n{change_message}"
+        # textは長いと切り詰められるため、本文は行の区切りでsectionブロック(1つあたり3000文字まで)に分け、
+        # 1メッセージあたり最大50ブロックずつ送る
+        sections = _split_section_text(text)
+        schedule_channel = await self.get_or_create_schedule_channel(team_id)
+        for i in range(0, len(sections), SLACK_MAX_BLOCKS):
+            chunk = sections[i:i + SLACK_MAX_BLOCKS]
+            await app.client.chat_postMessage(
+                channel=schedule_channel,
+                text="\n".join(chunk),
+                blocks=[{"type": "section", "text": {"type": "mrkdwn", "text": section}} for section in chunk],
+                thread_ts=message_ts
+            )
 
     @staticmethod
     async def acknowledge_event(body: Dict[str, Any], ack: callable) -> None:
         await ack("リクエストを受け取り、処理中です。")
 
-    async def get_or_create_channel(self, channel_name: str) -> str:
-        channel_id = getattr(self, f"{channel_name}_channel_id")
-        if channel_id:
-            return channel_id
-
-        app = await self.get_app(self.team_id)
-        channels = await app.client.conversations_list()
-        for channel in channels["channels"]:
-            if channel["name"] == channel_name:
-                setattr(self, f"{channel_name}_channel_id", channel["id"])
-                return channel["id"]
+    async def get_or_create_channel(self, team_id: str, channel_name: str) -> str:
+        cache_key = (team_id, channel_name)
+        cached = self._channel_cache.get(cache_key)
+        if cached and time.time() - cached[1] < CHANNEL_CACHE_TTL:
+            return cached[0]
+
+        # 保存済みのチャンネルIDがあれば1回のget_itemで解決する
+        config_key = {'team_id': team_id, 'date': f'CONFIG#{channel_name}_channel'}
+        try:
+            table = await self.get_reminders_table()
+            response = await table.get_item(Key=config_key)
+        except ClientError as e:
+            # 取得できない場合はconversations_listでの検索にフォールバックする
+            self.logger.error(f"チャンネルIDの取得に失敗しました: {config_key}: {e}")
+            response = {}
+        app = await self.get_app(team_id)
+        if 'Item' in response:
+            channel_id = response['Item']['channel_id']
+            # アーカイブ・削除・名前変更されたチャンネルのIDを使い続けないよう、キャッシュ切れのたびに確認する
+            try:
+                channel = (await app.client.conversations_info(channel=channel_id))["channel"]
+                valid = not channel.get("is_archived") and channel.get("name") == channel_name
+            except SlackApiError as e:
+                if e.response["error"] != "channel_not_found":
+                    raise
+                valid = False
+            if valid:
+                self._channel_cache[cache_key] = (channel_id, time.time())
+                return channel_id
+            self.logger.info(f"保存済みの{channel_name}チャンネル {channel_id} が使えないため、チャンネルを探し直します。")
+            await self.delete_channel_id(config_key)
+
+        # カーソルでページングしながら探し、見つかった時点で打ち切る
+        async for page in await app.client.conversations_list(types="public_channel", exclude_archived=True, limit=1000):
+            for channel in page["channels"]:
+                if channel["name"] == channel_name:
+                    await self.save_channel_id(config_key, channel["id"])
+                    self._channel_cache[cache_key] = (channel["id"], time.time())
+                    return channel["id"]
         
         new_channel = await app.client.conversations_create(name=channel_name)
         channel_id = new_channel["channel"]["id"]
-        setattr(self, f"{channel_name}_channel_id", channel_id)
+        await self.save_channel_id(config_key, channel_id)
+        self._channel_cache[cache_key] = (channel_id, time.time())
         self.logger.info(f"新しい{channel_name}チャンネルを作成しました: {channel_id}")
 
-        users = await app.client.users_list()
-        for user in users["members"]:
-            if not user["is_bot"] and not user["is_app_user"]:
-                try:
-                    await app.client.conversations_invite(
-                        channel=channel_id,
-                        users=user["id"]
-                    )
-                except Exception as e:
-                    self.logger.error(f"ユーザー {user['id']} を{channel_name}チャンネルに追加できませんでした: {str(e)}")
+        user_ids = [
+            user["id"]
+            async for page in await app.client.users_list(limit=1000)
+            for user in page["members"]
+            if not user["is_bot"] and not user["is_app_user"]
+        ]
+
+        async def invite_batch(batch: List[str]) -> None:
+            # レート制限時の再試行はクライアントのAsyncRateLimitErrorRetryHandlerに任せる
+            # force=Trueで無効なユーザーを無視して残りを招待し、失敗分はerrorsで受け取る
+            response = await app.client.conversations_invite(
+                channel=channel_id, users=",".join(batch), force=True
+            )
+            for error in response.get("errors", []):
+                self.logger.error(f"ユーザー {error.get('user')} を{channel_name}チャンネルに追加できませんでした: {error.get('error')}")
+
+        batches = [user_ids[i:i + SLACK_INVITE_BATCH_SIZE] for i in range(0, len(user_ids), SLACK_INVITE_BATCH_SIZE)]
+        results = await asyncio.gather(*(invite_batch(batch) for batch in batches), return_exceptions=True)
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"ユーザー{len(batch)}人を{channel_name}チャンネルに追加できませんでした: {str(result)}")
 
         return channel_id
 
-    async def get_or_create_schedule_channel(self) -> str:
-        return await self.get_or_create_channel("schedule")
+    async def save_channel_id(self, config_key: Dict[str, str], channel_id: str) -> None:
+        """チャンネルIDをRemindersTableに保存する。日付がCONFIG#で始まるため当日分の取得や日付範囲のQueryには含まれない"""
+        try:
+            table = await self.get_reminders_table()
+            await table.put_item(Item={**config_key, 'channel_id': channel_id})
+        except ClientError as e:
+            self.logger.error(f"チャンネルIDの保存に失敗しました: {config_key}: {e}")
+
+    async def delete_channel_id(self, config_key: Dict[str, str]) -> None:
+        try:
+            table = await self.get_reminders_table()
+            await table.delete_item(Key=config_key)
+        except ClientError as e:
+            self.logger.error(f"チャンネルIDの削除に失敗しました: {config_key}: {e}")
 
-    async def get_or_create_reminder_channel(self) -> str:
-        return await self.get_or_create_channel("reminder")
+    async def get_or_create_schedule_channel(self, team_id: str) -> str:
+        return await self.get_or_create_channel(team_id, "schedule")
+
+    async def get_or_create_reminder_channel(self, team_id: str) -> str:
+        return await self.get_or_create_channel(team_id, "reminder")
 
     async def handle_app_mention(self, body: Dict[str, Any], say: callable) -> None:
         self.logger.info(f"受信したメンション: {body}")
@@ -223,30 +445,26 @@ class ReminderApp:
         channel: str = event["channel"]
         text: str = event["text"]
         message_ts: str = event["ts"]
-        self.team_id = body["team_id"]
+        team_id: str = body["team_id"]
 
         if "test" in text.lower():
             await self.send_reminders(body, None)
             await say("テストリマインダーを送信しました。")
             return
 
-        schedule_channel = await self.get_or_create_schedule_channel()
+        schedule_channel = await self.get_or_create_schedule_channel(team_id)
         if channel == schedule_channel:
-            success = await self.parse_and_save_reminders(text, message_ts)
-            app = await self.get_app(self.team_id)
+            app = await self.get_app(team_id)
+            success = await self.parse_and_save_reminders(app, team_id, text, message_ts)
+            reply_text = "リマインダーの設定が完了しました。" if success else "リマインダーの設定に失敗しました。正しい形式で入力されているか確認してください。"
+            await app.client.chat_postMessage(
+                channel=channel,
+                text=reply_text,
+                thread_ts=message_ts
+            )
             if success:
-                await app.client.chat_postMessage(
-                    channel=channel,
-                    text="リマインダーの設定が完了しました。",
-                    thread_ts=message_ts
-                )
                 self.logger.info(f"リマインダーの設定が完了しました: {message_ts}")
             else:
-                await app.client.chat_postMessage(
-                    channel=channel,
-                    text="リマインダーの設定に失敗しました。正しい形式で入力されているか確認してください。",
-                    thread_ts=message_ts
-                )
                 self.logger.error(f"リマインダーの設定に失敗しました: {message_ts}")
         else:
             self.logger.info(f"スケジュールチャンネルではなかったため、リマインドは更新されませんでした: {message_ts}")
@@ -256,14 +474,21 @@ class ReminderApp:
         event: Dict[str, Any] = body["event"]
         channel: str = event["channel"]
         message: Dict[str, Any] = event["message"]
+
+        # リアクションやURL展開などテキストが変わらない変更、ボット・入退室メッセージは処理しない
+        previous_message: Dict[str, Any] = event.get("previous_message", {})
+        if message.get("subtype") in _IGNORED_MESSAGE_SUBTYPES or previous_message.get("text") == message.get("text"):
+            self.logger.debug(f"リマインダーに関係しないメッセージ変更のためスキップしました: {message.get('ts')}")
+            return
+
         text: str = message["text"]
         message_ts: str = message["ts"]
-        self.team_id = body["team_id"]
+        team_id: str = body["team_id"]
 
-        schedule_channel = await self.get_or_create_schedule_channel()
+        schedule_channel = await self.get_or_create_schedule_channel(team_id)
         if channel == schedule_channel and message.get("bot_id") is None:
-            success = await self.parse_and_save_reminders(text, message_ts)
-            app = await self.get_app(self.team_id)
+            app = await self.get_app(team_id)
+            success = await self.parse_and_save_reminders(app, team_id, text, message_ts)
             if success:
                 self.logger.info(f"リマインダーが更新されました: {message_ts}")
             else:
@@ -276,69 +501,138 @@ class ReminderApp:
 
     async def send_reminders(self, event: Dict[str, Any], context: Any) -> None:
         self.logger.info(f"受信したイベント: {event}")
-        jst: pytz.timezone = pytz.timezone('Asia/Tokyo')
-        now: datetime = datetime.now(jst)
-        today: str = now.strftime("%m/%d")
+        today: str = datetime.now(_JST).strftime("%m/%d")
+
+        if self.env('REMINDERS_USE_SCAN'):
+            # date-index 移行中のフォールバック
+            request_kwargs: Dict[str, Any] = {
+                'FilterExpression': '#date = :today',
+                'ExpressionAttributeNames': {'#date': 'date'},
+                'ExpressionAttributeValues': {':today': today}
+            }
+        else:
+            # date-index (GSI) から当日分のみ取得
+            request_kwargs = {
+                'IndexName': 'date-index',
+                'KeyConditionExpression': Key('date').eq(today)
+            }
 
-        table = self.dynamodb.Table('RemindersTable')
+        items: List[Dict[str, Any]] = []
         try:
-            response: Dict[str, Any] = table.scan(
-                FilterExpression='#date = :today',
-                ExpressionAttributeNames={'#date': 'date'},
-                ExpressionAttributeValues={':today': today}
-            )
+            table = await self.get_reminders_table()
+            read = table.scan if 'FilterExpression' in request_kwargs else table.query
+            while True:
+                response: Dict[str, Any] = await read(**request_kwargs)
+                items.extend(response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    break
+                request_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
         except ClientError as e:
             self.logger.error(f"リマインダーの取得に失敗しました: {e}")
             return
 
         reminders_by_team = {}
-        for item in response.get('Items', []):
+        for item in items:
             team_id = item['team_id']
             if team_id not in reminders_by_team:
                 reminders_by_team[team_id] = []
             reminders_by_team[team_id].append(item)
 
+        tasks = []
+        sent_items: List[Dict[str, Any]] = []
         for team_id, reminders in reminders_by_team.items():
-            self.team_id = team_id
             app = await self.get_app(team_id)
-            reminder_channel = await self.get_or_create_reminder_channel()
+            reminder_channel = await self.get_or_create_reminder_channel(team_id)
             for item in reminders:
                 users: List[str] = item['users']
                 message: str = item['message']
                 mentions: str = ' '.join([f"{user}" for user in users])
-                await app.client.chat_postMessage(
+                tasks.append(app.client.chat_postMessage(
                     channel=reminder_channel,
                     text=f"{mentions} リマインダー: {message}"
-                )
+                ))
+                sent_items.append(item)
+
+        # 全チームのリマインダー送信を並行して行う
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for item, result in zip(sent_items, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"リマインダーの送信に失敗しました: {item}: {result}")
+            else:
                 self.logger.info(f"リマインダーを送信しました: {item}")
 
     async def get_bot_token(self, team_id: str) -> str:
-        ssm = boto3.client('ssm')
+        cached = self._token_cache.get(team_id)
+        if cached and time.time() - cached[1] < TOKEN_CACHE_TTL:
+            return cached[0]
         parameter_name = f"/slackapp/SLACK_BOT_TOKEN/{team_id}"
+        ssm = await self.get_async_ssm()
         try:
-            response = ssm.get_parameter(Name=parameter_name, WithDecryption=True)
-            return response['Parameter']['Value']
+            response = await ssm.get_parameter(Name=parameter_name, WithDecryption=True)
+            token = response['Parameter']['Value']
+            self._token_cache[team_id] = (token, time.time())
+            return token
         except ssm.exceptions.ParameterNotFound:
-            self.logger.info(f"パラメータ {parameter_name} が見つかりません。デフォルトのSLACK_BOT_TOKENを使用します。")
-            return os.environ[team_id]
+            self.logger.info(f"パラメータ {parameter_name} が見つかりません。設定値{team_id}のトークンを使用します。")
         except Exception as e:
             self.logger.error(f"パラメータの取得中にエラーが発生しました: {str(e)}")
-            return os.environ[team_id]
+
+        token = self.env(team_id)
+        if not token:
+            # トークンなしでAsyncWebClientを作るとnot_authedで失敗し原因が分かりにくいため、ここで止める
+            self.logger.error(f"チーム {team_id} のボットトークンがSSMにも設定値にもありません。")
+            raise Exception(f"チーム {team_id} のボットトークンが見つかりません。")
+        return token
+
+    async def _prewarm_tokens(self) -> None:
+        """/slackapp/SLACK_BOT_TOKEN/配下の全チームのトークンを取得して_token_cacheに入れる"""
+        prefix = "/slackapp/SLACK_BOT_TOKEN/"
+        try:
+            ssm = await self.get_async_ssm()
+            paginator = ssm.get_paginator('get_parameters_by_path')
+            now = time.time()
+            async for page in paginator.paginate(Path=prefix, Recursive=True, WithDecryption=True):
+                for param in page['Parameters']:
+                    self._token_cache[param['Name'][len(prefix):]] = (param['Value'], now)
+            self.logger.info(f"{len(self._token_cache)}チーム分のトークンを取得しました。")
+        except Exception as e:
+            # 取得できなくてもget_bot_tokenがチームごとに取得するため、起動は続ける
+            self.logger.error(f"トークンの一括取得に失敗しました: {str(e)}")
+
+    async def get_reminders_table(self) -> Any:
+        if self._reminders_table is None:
+            async with self._async_exit_stack_lock:
+                # ロック待ちの間に他のタスクが作成済みなら、それを使う
+                if self._reminders_table is None:
+                    dynamodb = await self._async_exit_stack.enter_async_context(
+                        self.session.resource('dynamodb', region_name=self.region)
+                    )
+                    self._reminders_table = await dynamodb.Table('RemindersTable')
+        return self._reminders_table
+
+    async def get_async_ssm(self) -> Any:
+        if self._async_ssm is None:
+            async with self._async_exit_stack_lock:
+                if self._async_ssm is None:
+                    self._async_ssm = await self._async_exit_stack.enter_async_context(
+                        self.session.client('ssm', region_name=self.region)
+                    )
+        return self._async_ssm
 
     async def handle_app_installed(self, event: Dict[str, Any], client: Any) -> None:
         self.logger.info(f"アプリがインストールされました: {event}")
-        self.team_id = event["team_id"]
-        await self.get_or_create_schedule_channel()
-        await self.get_or_create_reminder_channel()
+        team_id: str = event["team_id"]
+        await self.get_or_create_schedule_channel(team_id)
+        await self.get_or_create_reminder_channel(team_id)
         self.logger.info("リマインダーチャンネルが作成され、全メンバーが追加されました。")
 
     async def handle_team_join(self, event: Dict[str, Any], client: Any) -> None:
         self.logger.info(f"新しいメンバーがワークスペースに参加しました: {event}")
         user_id = event["user"]["id"]
-        self.team_id = event["team_id"]
-        schedule_channel = await self.get_or_create_schedule_channel()
+        team_id: str = event["team_id"]
+        schedule_channel = await self.get_or_create_schedule_channel(team_id)
         try:
-            await self.app.client.conversations_invite(
+            await client.conversations_invite(
                 channel=schedule_channel,
                 users=user_id
             )
@@ -351,27 +645,28 @@ class ReminderApp:
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     reminder_app = ReminderApp()
     reminder_app.logger.info(f"受信したイベント: {event}")
+    if not reminder_app.aws_connection_tested:
+        _LOOP.run_until_complete(reminder_app.test_aws_connection())
     if 'body' in event:
-        body = json.loads(event['body'])
+        body = _json_loads(event['body'])
         if 'type' in body and body['type'] == 'url_verification':
             return {
                 'statusCode': 200,
-                'body': json.dumps({'challenge': body['challenge']})
+                'body': _json_dumps({'challenge': body['challenge']})
             }
         team_id = body.get('team_id')
 
-        app = asyncio.run(reminder_app.get_app(team_id))
-        slack_handler: SlackRequestHandler = SlackRequestHandler(app=app)
+        slack_handler = reminder_app._handlers.get(team_id)
+        if slack_handler is None:
+            app = _LOOP.run_until_complete(reminder_app.get_app(team_id))
+            slack_handler = reminder_app._handlers.setdefault(team_id, SlackRequestHandler(app=app))
         return slack_handler.handle(event, context)
     else:
-        asyncio.run(reminder_app.send_reminders(event, context))
-        for team_id in set(item['team_id'] for item in event.get('Items', [])):
-            reminder_app.team_id = team_id
-    
+        _LOOP.run_until_complete(reminder_app.send_reminders(event, context))
 
     return {
         "statusCode": 200,
-        "body": json.dumps(
+        "body": _json_dumps(
             {
                 "message": "リマインダーが正常に処理されました",
             }